@@ -0,0 +1,34 @@
+"""Add delta versioning to cleaning history
+
+Revision ID: 4c1e7b9a2d53
+Revises: a98de802578a
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e7b9a2d53'
+down_revision: Union[str, Sequence[str], None] = 'a98de802578a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cleaning_history', sa.Column('storage_format', sa.String(), nullable=True))
+    op.add_column('cleaning_history', sa.Column('base_history_id', sa.Integer(), sa.ForeignKey('cleaning_history.id'), nullable=True))
+    op.add_column('cleaning_history', sa.Column('stored_bytes', sa.Integer(), nullable=True))
+    op.add_column('cleaning_history', sa.Column('full_bytes', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cleaning_history', 'full_bytes')
+    op.drop_column('cleaning_history', 'stored_bytes')
+    op.drop_column('cleaning_history', 'base_history_id')
+    op.drop_column('cleaning_history', 'storage_format')
@@ -4,6 +4,7 @@ from app import routes
 from app.database import engine, Base
 from app.models import user, file_upload, cleaning_history
 from app.routes import auth  # Ensure models are loaded
+from app.utils.cleaning_tools import shutdown_process_pool
 
 app = FastAPI()
 
@@ -24,4 +25,9 @@ async def on_startup():
 
     # Create database tables if not already created
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Stop the shared cleaning worker pool."""
+    shutdown_process_pool()
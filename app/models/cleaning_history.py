@@ -12,6 +12,10 @@ class CleaningHistory(Base):
     cleaned_file_path = Column(String, nullable=True)  
     cleaning_steps = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    storage_format = Column(String, default="full", nullable=True)  # "full" CSV or "delta" against base_history_id
+    base_history_id = Column(Integer, ForeignKey("cleaning_history.id"), nullable=True)
+    stored_bytes = Column(Integer, nullable=True)
+    full_bytes = Column(Integer, nullable=True)
 
 
     user = relationship("User", back_populates="cleaning_history")
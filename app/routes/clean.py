@@ -1,77 +1,186 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.database import get_db
+from sqlalchemy import or_
+from app.database import get_db, AsyncSessionLocal
 from app.models.user import User
 from app.models.file_upload import FileUpload
 from app.models.cleaning_history import CleaningHistory
 from app.utils.auth import get_current_user
-from app.utils.cleaning_tools import get_cleaning_agent  # Import LangChain cleaning agent
+from app.utils.cleaning_tools import get_cleaning_agent, clean_chunks, read_csv_chunks  # Import LangChain cleaning agent
+from app.utils.imputation import parse_strategies, fit_numeric_stats
+from app.utils.type_coercion import coerce_types
+from app.utils.versioning import build_delta, load_version, diff_versions, DELTA_MAX_RATIO
+from app.utils.storage import storage
 import pandas as pd
+import asyncio
+import io
+import json
 import os
+import time
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 router = APIRouter(prefix="/clean", tags=["cleaning"])
 
-UPLOAD_DIR = "app/static/uploads"
-CLEANED_DIR = "app/static/cleaned"
+CLEANED_PREFIX = "cleaned"  # Storage key prefix for cleaned files
 
-# Endpoint to clean a file
-@router.post("/{file_id}")
-async def clean_file(
-    file_id: int,
-    prompt: str = Query("Please clean this file with the necessary steps.", description="Custom cleaning instructions for the file"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
+CHUNK_ROWS = 50_000  # Rows per chunk when reading large CSVs
+
+async def _get_file_record(db: AsyncSession, file_id: int, user_id: int) -> FileUpload:
     # Fetch the uploaded file record from the database
     result = await db.execute(
-        select(FileUpload).filter(FileUpload.id == file_id, FileUpload.user_id == current_user.id)
+        select(FileUpload).filter(FileUpload.id == file_id, FileUpload.user_id == user_id)
     )
     file_record = result.scalar_one_or_none()
 
     if not file_record:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Uploaded file not found")
+    return file_record
 
-    # Load the CSV into DataFrame
+@asynccontextmanager
+async def _local_copy(file_key: str):
+    # Fetch (and pin) a local copy of a stored file without blocking the event loop
+    copy = storage.local_copy(file_key)
+    path = await asyncio.to_thread(copy.__enter__)
     try:
-        df = pd.read_csv(file_record.file_path)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading CSV file: {e}")
-
-    # Get the cleaning agent and clean the file
-    agent = get_cleaning_agent(df)
-    cleaned_df = agent.run(prompt)  # Use the user-provided prompt
-
-    # Save cleaned CSV file
-    os.makedirs(CLEANED_DIR, exist_ok=True)
-    cleaned_filename = f"{uuid.uuid4()}_cleaned_{file_record.original_filename}"
-    cleaned_filepath = os.path.join(CLEANED_DIR, cleaned_filename)
-    cleaned_df.to_csv(cleaned_filepath, index=False,na_rep="NaN")
+        yield path
+    finally:
+        copy.__exit__(None, None, None)
 
-    # Save cleaning history in DB
-    numeric_cols = list(cleaned_df.select_dtypes(include=["number"]).columns)
+async def _find_base_version(db: AsyncSession, file_id: int):
+    # Latest full copy of this upload's cleaned output; deltas are always taken against one
+    result = await db.execute(
+        select(CleaningHistory).filter(
+            CleaningHistory.file_id == file_id,
+            CleaningHistory.cleaned_file_path.isnot(None),
+            or_(CleaningHistory.storage_format == "full", CleaningHistory.storage_format.is_(None))
+        ).order_by(CleaningHistory.id.desc()).limit(1)
+    )
+    return result.scalar_one_or_none()
+
+def _save_cleaned_csv(cleaned_df: pd.DataFrame, original_filename: str, base: CleaningHistory = None):
+    # Store a row-level delta against the base version when it is much smaller than a full copy
+    cleaned_filename = f"{uuid.uuid4()}_cleaned_{original_filename}"
+    csv_text = cleaned_df.to_csv(index=False, na_rep="NaN")
+    full_bytes = len(csv_text.encode("utf-8"))
+
+    delta = None
+    if base is not None and storage.exists(base.cleaned_file_path):
+        with storage.local_copy(base.cleaned_file_path) as base_path:
+            delta = build_delta(base_path, csv_text)
+
+    if delta is not None and len(delta) < DELTA_MAX_RATIO * full_bytes:
+        cleaned_filename += ".delta.json.gz"
+        cleaned_filepath = f"{CLEANED_PREFIX}/{cleaned_filename}"
+        storage.write_bytes(cleaned_filepath, delta)
+        storage_info = {"storage_format": "delta", "base_history_id": base.id, "stored_bytes": len(delta), "full_bytes": full_bytes}
+    else:
+        cleaned_filepath = f"{CLEANED_PREFIX}/{cleaned_filename}"
+        storage.write_bytes(cleaned_filepath, csv_text.encode("utf-8"))
+        storage_info = {"storage_format": "full", "base_history_id": None, "stored_bytes": full_bytes, "full_bytes": full_bytes}
+    return cleaned_filename, cleaned_filepath, storage_info
+
+async def _load_cleaned_version(db: AsyncSession, cleaning_record: CleaningHistory) -> pd.DataFrame:
+    # Full copies are read as-is, deltas are rebuilt from their base version
+    if cleaning_record.storage_format != "delta":
+        async with _local_copy(cleaning_record.cleaned_file_path) as path:
+            return await asyncio.to_thread(load_version, path)
+
+    result = await db.execute(select(CleaningHistory).filter(CleaningHistory.id == cleaning_record.base_history_id))
+    base = result.scalar_one_or_none()
+    if not base or not await asyncio.to_thread(storage.exists, base.cleaned_file_path):
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Base version of the cleaned file not found on the server")
+    # Both copies stay pinned until the version is rebuilt
+    async with _local_copy(base.cleaned_file_path) as base_path, _local_copy(cleaning_record.cleaned_file_path) as path:
+        return await asyncio.to_thread(load_version, path, base_path)
+
+def _storage_summary(storage_info: dict) -> dict:
+    saved = storage_info["full_bytes"] - storage_info["stored_bytes"]
+    return {**storage_info, "saved_bytes": saved, "saved_pct": round(100 * saved / storage_info["full_bytes"], 1) if storage_info["full_bytes"] else 0.0}
+
+def _build_cleaning_steps(cleaned_df: pd.DataFrame, agent_stats: dict = None) -> dict:
     string_cols = list(cleaned_df.select_dtypes(include=["object"]).columns)
-    
-    cleaning_steps = {
+    return {
         "missing_values_filled_with_na": string_cols,
         "duplicates_removed": True,
-        "strings_normalized": string_cols
+        "strings_normalized": string_cols,
+        **(agent_stats or {})
     }
 
+def _parse_thresholds(fuzzy_columns: str):
+    # "email:0.9,name:0.85" -> {"email": 0.9, "name": 0.85}; empty string -> default thresholds
+    if fuzzy_columns is None:
+        return None
+    thresholds = {}
+    for item in filter(None, (part.strip() for part in fuzzy_columns.split(","))):
+        col, _, value = item.partition(":")
+        try:
+            thresholds[col.strip()] = float(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid similarity threshold for column '{col.strip()}'")
+        if not 0 < thresholds[col.strip()] <= 1:
+            raise HTTPException(status_code=400, detail=f"Similarity threshold for '{col.strip()}' must be between 0 and 1")
+    return thresholds
+
+async def _record_history(db: AsyncSession, user_id: int, file_id: int, cleaned_filepath, cleaning_steps: dict, storage_info: dict = None) -> CleaningHistory:
     cleaning_history = CleaningHistory(
-        user_id=current_user.id,
-        file_id=file_record.id,
+        user_id=user_id,
+        file_id=file_id,
         cleaned_file_path=cleaned_filepath,
         cleaning_steps=str(cleaning_steps),
-        created_at=datetime.utcnow()
+        created_at=datetime.utcnow(),
+        **(storage_info or {})
     )
 
     db.add(cleaning_history)
     await db.commit()
     await db.refresh(cleaning_history)
+    return cleaning_history
+
+def _parse_impute(impute: str):
+    # "age:median,score:constant=0" -> {"age": ("median", None), "score": ("constant", 0.0)}
+    if not impute:
+        return None
+    try:
+        return parse_strategies(impute)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Endpoint to clean a file
+@router.post("/{file_id}")
+async def clean_file(
+    file_id: int,
+    prompt: str = Query("Please clean this file with the necessary steps.", description="Custom cleaning instructions for the file"),
+    workers: int = Query(1, ge=1, le=os.cpu_count() or 1, description="Number of CPU cores used for column-wise cleaning steps"),
+    fuzzy_columns: str = Query(None, description="Enable near-duplicate merging with per-column similarity thresholds, e.g. 'email:1,name:0.85' (1 = exact match, empty for defaults)"),
+    impute: str = Query(None, description="Numeric imputation per column: mean, median, mode, constant=<value> or ffill, e.g. 'age:median,score:constant=0'"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    file_record = await _get_file_record(db, file_id, current_user.id)
+    near_duplicates = _parse_thresholds(fuzzy_columns)
+    strategies = _parse_impute(impute)
+
+    # Load the CSV into DataFrame (storage calls can hit the network, so they run off the event loop)
+    try:
+        async with _local_copy(file_record.file_path) as local_path:
+            df = await asyncio.to_thread(pd.read_csv, local_path)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading CSV file: {e}")
+
+    # Get the cleaning agent and clean the file
+    agent = get_cleaning_agent(df, workers=workers, near_duplicates=near_duplicates, impute=strategies)
+    cleaned_df = agent.run(prompt)  # Use the user-provided prompt
+
+    base = await _find_base_version(db, file_record.id)
+    cleaned_filename, cleaned_filepath, storage_info = await asyncio.to_thread(_save_cleaned_csv, cleaned_df, file_record.original_filename, base)
+
+    # Save cleaning history in DB
+    cleaning_steps = _build_cleaning_steps(cleaned_df, agent.stats)
+    cleaning_history = await _record_history(db, current_user.id, file_record.id, cleaned_filepath, cleaning_steps, storage_info)
 
     # Mock AI agent thinking and analysis
     ai_response = {
@@ -97,11 +206,184 @@ async def clean_file(
         "cleaned_file_id": cleaning_history.id,
         "original_rows": len(df),
         "cleaned_rows": len(cleaned_df),
+        "storage": _storage_summary(storage_info),
         "user_prompt": prompt,  # now reflects user input
         "ai_response": ai_response
     }
 
 
+def _sse(event: str, data: dict) -> str:
+    # Format a single Server-Sent Event
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _estimate_rows(file_key: str) -> int:
+    # Row count estimated from the object size and a ranged read of its first MB (header excluded)
+    size = storage.size(file_key)
+    head = storage.read_range(file_key, 0, 1 << 20)
+    lines = head.count(b"\n")
+    if not head or size <= len(head):
+        return max(lines - 1, 0)
+    return max(int(size * lines / len(head)) - 1, 0)
+
+# Endpoint to clean a file while streaming progress events (SSE)
+@router.get("/progress/{file_id}")
+async def clean_file_with_progress(
+    file_id: int,
+    prompt: str = Query("Please clean this file with the necessary steps.", description="Custom cleaning instructions for the file"),
+    workers: int = Query(1, ge=1, le=os.cpu_count() or 1, description="Number of CPU cores used for column-wise cleaning steps"),
+    fuzzy_columns: str = Query(None, description="Enable near-duplicate merging with per-column similarity thresholds, e.g. 'email:1,name:0.85' (1 = exact match, empty for defaults)"),
+    impute: str = Query(None, description="Numeric imputation per column: mean, median, mode, constant=<value> or ffill, e.g. 'age:median,score:constant=0'"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    file_record = await _get_file_record(db, file_id, current_user.id)
+    user_id = current_user.id
+    near_duplicates = _parse_thresholds(fuzzy_columns)
+    strategies = _parse_impute(impute)
+
+    async def event_stream():
+        started = time.monotonic()
+        try:
+            # Load the CSV chunk by chunk, reporting rows read so far
+            total_rows = await asyncio.to_thread(_estimate_rows, file_record.file_path)
+            yield _sse("load_started", {"file_id": file_record.id, "estimated_rows": total_rows})
+
+            # The reader keeps its file handle open, so the copy only needs pinning until it is opened
+            async with _local_copy(file_record.file_path) as local_path:
+                reader = pd.read_csv(local_path, chunksize=CHUNK_ROWS)
+            chunks, rows_loaded = [], 0
+            while (chunk := await asyncio.to_thread(next, reader, None)) is not None:
+                chunks.append(chunk)
+                rows_loaded += len(chunk)
+                elapsed = time.monotonic() - started
+                remaining = max(total_rows - rows_loaded, 0)
+                yield _sse("chunk_loaded", {
+                    "rows_processed": rows_loaded,
+                    "estimated_rows": total_rows,
+                    "eta_seconds": round(elapsed / rows_loaded * remaining, 2),
+                })
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            original_rows = len(df)
+
+            # Run the agent one tool at a time so each step can be reported
+            agent = get_cleaning_agent(df, workers=workers, near_duplicates=near_duplicates, impute=strategies)
+            steps = agent.iter_steps()
+            step_times = []
+            pending = None  # Step currently running in a worker thread
+            try:
+                for i, tool in enumerate(agent.tools, 1):
+                    yield _sse("step_started", {"step": i, "total_steps": len(agent.tools), "tool": tool.name, "description": tool.description})
+                    step_start = time.monotonic()
+                    # Shielded: a client disconnect cancels this await, but the thread keeps running the step
+                    pending = asyncio.ensure_future(asyncio.to_thread(next, steps))
+                    _, _, result = await asyncio.shield(pending)
+                    pending = None
+                    step_times.append(time.monotonic() - step_start)
+                    remaining_steps = len(agent.tools) - i
+                    yield _sse("step_finished", {
+                        "step": i,
+                        "tool": tool.name,
+                        "result": result,
+                        "rows_processed": len(agent.df),
+                        "eta_seconds": round(sum(step_times) / len(step_times) * remaining_steps, 2),
+                    })
+            finally:
+                # Closing a generator that is still running in the thread raises, so let the step finish first
+                if pending is not None:
+                    await asyncio.wait([pending])
+                steps.close()
+            cleaned_df = agent.df
+
+            # Save cleaned file and history (the request session is gone once streaming starts)
+            cleaning_steps = _build_cleaning_steps(cleaned_df, agent.stats)
+            async with AsyncSessionLocal() as session:
+                base = await _find_base_version(session, file_record.id)
+                cleaned_filename, cleaned_filepath, storage_info = await asyncio.to_thread(_save_cleaned_csv, cleaned_df, file_record.original_filename, base)
+                cleaning_history = await _record_history(session, user_id, file_record.id, cleaned_filepath, cleaning_steps, storage_info)
+
+            yield _sse("completed", {
+                "cleaned_file_id": cleaning_history.id,
+                "cleaned_file": cleaned_filename,
+                "cleaning_summary": cleaning_steps,
+                "original_rows": original_rows,
+                "cleaned_rows": len(cleaned_df),
+                "storage": _storage_summary(storage_info),
+                "elapsed_seconds": round(time.monotonic() - started, 2),
+            })
+        except Exception as e:
+            yield _sse("error", {"detail": f"Error cleaning file: {e}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Endpoint to clean a file on read and stream the cleaned CSV straight back (nothing written to disk)
+@router.get("/stream/{file_id}")
+async def stream_cleaned_file(
+    file_id: int,
+    impute: str = Query(None, description="Numeric imputation per column: mean, median, mode, constant=<value> or ffill, e.g. 'age:median,score:constant=0'"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    file_record = await _get_file_record(db, file_id, current_user.id)
+    user_id = current_user.id
+    strategies = _parse_impute(impute)
+
+    stats = {}
+    try:
+        async with _local_copy(file_record.file_path) as local_path:
+            impute_stats = None
+            if strategies:
+                # Extra streaming pass for the imputation statistics, one chunk in memory at a time
+                stats_formats = {}  # Same first chunk, so the same formats as the cleaning pass below
+                stats_chunks = (coerce_types(chunk, formats=stats_formats) for chunk in read_csv_chunks(local_path, CHUNK_ROWS))
+                impute_stats = await asyncio.to_thread(fit_numeric_stats, stats_chunks, strategies)
+            # The reader keeps its file handle open, so the copy only needs pinning until it is opened
+            reader = read_csv_chunks(local_path, CHUNK_ROWS)
+        cleaned_chunks = clean_chunks(reader, stats, strategies, impute_stats)
+        # Clean the first chunk up front so bad files fail with a proper HTTP error
+        first_chunk = await asyncio.to_thread(next, cleaned_chunks, None)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading CSV file: {e}")
+
+    def to_csv(chunk: pd.DataFrame, header: bool) -> bytes:
+        return chunk.to_csv(index=False, header=header, na_rep="NaN").encode("utf-8")
+
+    async def csv_stream():
+        if first_chunk is None:
+            return
+        yield to_csv(first_chunk, header=True)
+        while (chunk := await asyncio.to_thread(next, cleaned_chunks, None)) is not None:
+            yield await asyncio.to_thread(to_csv, chunk, False)
+
+        # Record the run once the last chunk has gone out
+        cleaning_steps = {
+            "types_coerced": stats["types_coerced"],
+            "missing_values_filled_with_na": {
+                "columns": list(stats["filled_count"]),
+                "filled_count": stats["filled_count"],
+            },
+            "duplicates_removed": {"removed_count": stats["duplicates_removed"]},
+            "numeric_imputed": stats["numeric_imputed"],
+            "strings_normalized": list(stats["filled_count"]),
+            "streamed_download": {
+                "original_rows": stats["original_rows"],
+                "cleaned_rows": stats["cleaned_rows"],
+            },
+        }
+        async with AsyncSessionLocal() as session:
+            await _record_history(session, user_id, file_record.id, None, cleaning_steps)
+
+    return StreamingResponse(
+        csv_stream(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename=cleaned_{file_record.original_filename}"}
+    )
+
+
 # Endpoint to download the cleaned file
 @router.get("/download/{cleaned_file_id}")
 async def download_cleaned_file(
@@ -123,21 +405,70 @@ async def download_cleaned_file(
 
     # Get the cleaned file path from the cleaning history
     cleaned_file_path = cleaning_record.cleaned_file_path
+    if not cleaned_file_path:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="This run was streamed and has no stored file")
 
     # Ensure the cleaned file exists before attempting to serve it
-    if not os.path.exists(cleaned_file_path):
+    if not await asyncio.to_thread(storage.exists, cleaned_file_path):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Cleaned file not found on the server")
 
-    # Serve the cleaned file for download
-    return FileResponse(
-        cleaned_file_path, 
-        media_type='application/octet-stream', 
-        filename=os.path.basename(cleaned_file_path)
+    # Deltas are rebuilt from their base version and streamed back as CSV
+    if cleaning_record.storage_format == "delta":
+        cleaned_rows = await _load_cleaned_version(db, cleaning_record)
+        filename = os.path.basename(cleaned_file_path).removesuffix(".delta.json.gz")
+        return StreamingResponse(
+            io.StringIO(cleaned_rows.to_csv(index=False)),
+            media_type='application/octet-stream',
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    # Serve the cleaned file for download, streamed from storage (a plain iterator, so Starlette reads it in a worker thread)
+    return StreamingResponse(
+        storage.iter_chunks(cleaned_file_path),
+        media_type='application/octet-stream',
+        headers={"Content-Disposition": f"attachment; filename={os.path.basename(cleaned_file_path)}"}
     )
 
 
 
 
+# Endpoint to diff two cleaning runs row by row
+@router.get("/diff/{from_cleaned_file_id}/{to_cleaned_file_id}")
+async def diff_cleaned_files(
+    from_cleaned_file_id: int,
+    to_cleaned_file_id: int,
+    key: str = Query(None, description="Column identifying a row, so edited rows are reported as changed instead of deleted + inserted"),
+    limit: int = Query(20, ge=0, le=1000, description="Maximum example rows returned per category"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    records = {}
+    for cleaned_file_id in (from_cleaned_file_id, to_cleaned_file_id):
+        result = await db.execute(
+            select(CleaningHistory).filter(
+                CleaningHistory.id == cleaned_file_id,
+                CleaningHistory.user_id == current_user.id
+            )
+        )
+        record = result.scalar_one_or_none()
+        if not record or not record.cleaned_file_path:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Cleaned file {cleaned_file_id} not found")
+        if not await asyncio.to_thread(storage.exists, record.cleaned_file_path):
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Cleaned file not found on the server")
+        records[cleaned_file_id] = record
+
+    old_rows = await _load_cleaned_version(db, records[from_cleaned_file_id])
+    new_rows = await _load_cleaned_version(db, records[to_cleaned_file_id])
+    diff = await asyncio.to_thread(diff_versions, old_rows, new_rows, key, limit)
+
+    return {
+        "from_cleaned_file_id": from_cleaned_file_id,
+        "to_cleaned_file_id": to_cleaned_file_id,
+        "key": key,
+        **diff
+    }
+
+
 # Endpoint to get cleaning history for a user
 @router.get("/history/{user_id}")
 async def get_cleaning_history(
@@ -159,9 +490,6 @@ async def get_cleaning_history(
     return [{"file_id": item.file_id, "cleaned_file": item.cleaned_file_path, "cleaning_steps": item.cleaning_steps, "cleaned_at": item.cleaned_at} for item in history]
 
 # Endpoint to get cleaning report for a specific cleaned file
-from fastapi.responses import StreamingResponse
-import io
-
 @router.get("/report/{file_id}")
 async def get_cleaning_report(
     file_id: int,
@@ -179,7 +507,7 @@ async def get_cleaning_report(
     # Fetch original file
     result_file = await db.execute(select(FileUpload).filter(FileUpload.id == cleaning_record.file_id))
     file_record = result_file.scalar_one_or_none()
-    if not file_record or not file_record.file_path or not os.path.exists(file_record.file_path):
+    if not file_record or not file_record.file_path or not await asyncio.to_thread(storage.exists, file_record.file_path):
         raise HTTPException(status_code=404, detail="Original file not found on server")
 
     # Load cleaning steps
@@ -207,6 +535,26 @@ async def get_cleaning_report(
             else:
                 affected_cols = str(info)
                 summary = ""
+        elif step == "types_coerced":
+            affected_cols = ", ".join(info)
+            summary = ", ".join(
+                f"{col}: {entry.get('type')} ({entry.get('unparseable_count', 0)} unparseable)" for col, entry in info.items()
+            )
+        elif step == "numeric_imputed":
+            affected_cols = ", ".join(info)
+            summary = ", ".join(
+                f"{col}: {entry.get('strategy')}"
+                + (f"={entry['value']:g}" if entry.get("value") is not None else "")
+                + f" ({entry.get('filled_count', 0)} filled)"
+                + (f" - {entry['note']}" if entry.get("note") else "")
+                for col, entry in info.items()
+            )
+        elif step == "near_duplicates_merged":
+            affected_cols = ", ".join(info.get("thresholds", {}))
+            summary = f"{info.get('removed_count', 0)} near-duplicate rows merged into {info.get('cluster_count', 0)} clusters"
+        elif step == "streamed_download":
+            affected_cols = ""
+            summary = f"Cleaned on read, {info.get('cleaned_rows', 0)} rows streamed without storing a file"
         elif step == "strings_normalized":
             if isinstance(info, list):
                 affected_cols = ", ".join(info)
@@ -221,8 +569,12 @@ async def get_cleaning_report(
         report_rows.append({"Cleaning Step": step, "Affected Columns": affected_cols, "Summary": summary})
 
     # Row summary
-    original_rows = len(pd.read_csv(file_record.file_path))
-    cleaned_rows = len(pd.read_csv(cleaning_record.cleaned_file_path))
+    async with _local_copy(file_record.file_path) as original_path:
+        original_rows = len(await asyncio.to_thread(pd.read_csv, original_path))
+    if cleaning_record.cleaned_file_path:
+        cleaned_rows = len(await _load_cleaned_version(db, cleaning_record))
+    else:
+        cleaned_rows = cleaning_steps.get("streamed_download", {}).get("cleaned_rows", 0)
     report_rows.extend([
         {"Cleaning Step": "Row Summary", "Affected Columns": "", "Summary": ""},
         {"Cleaning Step": "Original Rows", "Affected Columns": str(original_rows), "Summary": ""},
@@ -2,19 +2,30 @@ from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.utils.auth import get_current_user
+from app.utils.storage import storage
 from app.models.file_upload import FileUpload
 from app.models.user import User
-import aiofiles
-import os
+import asyncio
 import uuid
-import csv
+from contextlib import asynccontextmanager
 
 router = APIRouter(prefix="/files", tags=["files"])
 
-UPLOAD_DIR = "app/static/uploads"
+UPLOAD_PREFIX = "uploads"  # Storage key prefix for uploaded files
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
-# Ensure the upload directory exists
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+@asynccontextmanager
+async def _open_write(file_key: str):
+    # Opening and completing a write can hit the network (multipart create / complete), so both run in a thread
+    writer_context = storage.open_write(file_key)
+    writer = await asyncio.to_thread(writer_context.__enter__)
+    try:
+        yield writer
+    except BaseException as e:
+        if not await asyncio.to_thread(writer_context.__exit__, type(e), e, e.__traceback__):
+            raise
+    else:
+        await asyncio.to_thread(writer_context.__exit__, None, None, None)
 
 @router.post("/upload-csv")
 async def upload_csv(
@@ -26,26 +37,20 @@ async def upload_csv(
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Only CSV files are allowed")
 
-    # Generate unique file name
+    # Generate unique storage key
     unique_filename = f"{uuid.uuid4()}_{file.filename}"
-    file_location = os.path.join(UPLOAD_DIR, unique_filename)
+    file_key = f"{UPLOAD_PREFIX}/{unique_filename}"
 
     try:
-        # Save the file asynchronously
-        async with aiofiles.open(file_location, 'wb') as buffer:
-            content = await file.read()
-            await buffer.write(content)
-
-        # Process the CSV data (e.g., cleaning operations could be added here)
-        with open(file_location, 'r') as csvfile:
-            csv_reader = csv.reader(csvfile)
-            for row in csv_reader:
-                pass  # Add your row processing logic here
+        # Stream the upload into storage chunk by chunk (multipart on object stores)
+        async with _open_write(file_key) as writer:
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                await asyncio.to_thread(writer.write, chunk)
 
         # Save file metadata to DB
         new_file = FileUpload(
             original_filename=file.filename,  # Changed to match the column name in DB
-            file_path=file_location,
+            file_path=file_key,
             user_id=current_user.id
         )
         db.add(new_file)
@@ -54,8 +59,8 @@ async def upload_csv(
 
     except Exception as e:
         # Remove the file if error occurs
-        if os.path.exists(file_location):
-            os.remove(file_location)
+        if await asyncio.to_thread(storage.exists, file_key):
+            await asyncio.to_thread(storage.delete, file_key)
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
     return {
@@ -64,4 +69,3 @@ async def upload_csv(
         "uploaded_at": new_file.uploaded_at,
         "message": "File uploaded and processed successfully"
     }
-
@@ -1,6 +1,20 @@
 from langchain.tools import tool
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from multiprocessing import shared_memory
+import multiprocessing
+import os
+import threading
+from app.utils.near_duplicates import remove_near_duplicates
+from app.utils.type_coercion import coerce_types
+from app.utils.imputation import fit_numeric_stats, impute_numeric, iter_blocks, finalize_report
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+
+DEDUP_SUBSET = ["email", "signup_date"]  # Columns identifying a duplicate row
+NORMALIZED_COLUMNS = ["name", "email"]  # The only columns normalize_strings changes
 
 # 1️⃣ Fill missing values
 def fill_missing_values(df: pd.DataFrame):
@@ -12,7 +26,7 @@ def fill_missing_values(df: pd.DataFrame):
 
 # 2️⃣ Remove duplicates
 def remove_duplicates(df: pd.DataFrame):
-    df = df.drop_duplicates(subset=["email", "signup_date"], keep="first").reset_index(drop=True)
+    df = df.drop_duplicates(subset=DEDUP_SUBSET, keep="first").reset_index(drop=True)
     return df
 
 # 3️⃣ Normalize strings
@@ -25,17 +39,240 @@ def normalize_strings(df: pd.DataFrame):
             df[col] = df[col].str.lower().str.strip()  # Lowercase emails
     return df
 
+# 📥 Read a CSV in chunks that all share the first chunk's column types
+def _chunk_dtypes(first: pd.DataFrame) -> dict:
+    dtypes = {}
+    for col, dtype in first.dtypes.items():
+        if first[col].isna().all():
+            dtypes[col] = object  # Nothing seen yet, so keep the text
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[col] = "float64"  # Later chunks may have gaps, which int64 can't hold
+        elif pd.api.types.is_bool_dtype(dtype):
+            dtypes[col] = "boolean"
+        else:
+            dtypes[col] = dtype
+    return dtypes
+
+def read_csv_chunks(path: str, chunk_rows: int):
+    """Returns a chunked reader whose chunks all use the dtypes inferred from the first one.
+
+    Left alone, pandas infers types per chunk, so a text column that is empty in one chunk comes
+    back as float there and numbers switch between "31" and "31.0".
+    """
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        first = next(reader, None)
+    return pd.read_csv(path, chunksize=chunk_rows, dtype=None if first is None else _chunk_dtypes(first))
+
+# 🌊 Clean a stream of chunks without holding the whole file
+def clean_chunks(chunks, stats: dict, impute: dict = None, impute_stats: dict = None):
+    """Cleans DataFrame chunks one at a time (coerce, fill, impute, dedup across chunks, normalize), updating stats as it goes"""
+    seen = set()  # 64-bit hashes of the dedup keys seen so far
+    stats.setdefault("original_rows", 0)
+    stats.setdefault("cleaned_rows", 0)
+    stats.setdefault("duplicates_removed", 0)
+    filled = stats.setdefault("filled_count", {})
+    coerced = stats.setdefault("types_coerced", {})
+    imputed = stats.setdefault("numeric_imputed", {})
+    formats = {}  # Column formats inferred from the first chunk, reused for every later one
+
+    for chunk in chunks:
+        stats["original_rows"] += len(chunk)
+        coerce_types(chunk, coerced, formats)
+        string_cols = chunk.select_dtypes(include=["object"]).columns
+        for col, count in chunk[string_cols].isna().sum().items():
+            filled[col] = filled.get(col, 0) + int(count)
+        fill_missing_values(chunk)
+        if impute:
+            impute_numeric(chunk, impute, impute_stats, imputed)
+
+        # Same keys as remove_duplicates, but remembered between chunks
+        keys = pd.util.hash_pandas_object(chunk[DEDUP_SUBSET], index=False).to_numpy()
+        keep = np.ones(len(chunk), dtype=bool)
+        for i, key in enumerate(keys.tolist()):
+            if key in seen:
+                keep[i] = False
+            else:
+                seen.add(key)
+        chunk = chunk[keep].reset_index(drop=True)
+        stats["duplicates_removed"] += int((~keep).sum())
+
+        normalize_strings(chunk)
+        stats["cleaned_rows"] += len(chunk)
+        yield chunk
+    finalize_report(imputed)
+
+# ⚡ Run a per-column step (fill / normalize) across worker processes
+# Blocks travel as Arrow IPC streams in shared memory: one bulk copy in, zero-copy reads on the other side,
+# instead of pickling every string object twice.
+def _write_ipc(buf, table: pa.Table):
+    # Kept in its own function so every Arrow view of buf is released on return
+    with pa.ipc.new_stream(pa.FixedSizeBufferWriter(pa.py_buffer(buf)), table.schema) as writer:
+        writer.write_table(table)
+
+def _read_ipc(buf) -> pd.DataFrame:
+    # Blocks only hold string columns, which to_pandas always copies out of buf
+    with pa.ipc.open_stream(pa.py_buffer(buf)) as reader:
+        return reader.read_all().to_pandas()
+
+def _write_shared(table: pa.Table, name: str = None) -> str:
+    # Writes an Arrow table into a new shared memory block and returns the block's name
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(sink.size(), 1))
+    try:
+        _write_ipc(shm.buf, table)
+    except BaseException:
+        shm.unlink()
+        raise
+    shm.close()
+    return shm.name
+
+def _read_shared(name: str) -> pd.DataFrame:
+    shm = shared_memory.SharedMemory(name=name)
+    frame = _read_ipc(shm.buf)
+    shm.close()
+    return frame
+
+def _unlink_shared(name: str):
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+def _clean_shared_block(func, name: str):
+    # Runs in a worker: cleans one block and writes the result to "<name>_out", where the caller picks it up
+    block = func(_read_shared(name))
+    _write_shared(pa.Table.from_pandas(block, preserve_index=False), f"{name}_out")
+
+def _to_arrow_columns(df: pd.DataFrame, cols: list) -> dict:
+    # Columns holding anything but strings (mixed objects) can't be shared and are cleaned in place
+    arrays = {}
+    for col in cols:
+        try:
+            arrays[col] = pa.array(df[col], type=pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            continue
+    return arrays
+
+def _split_blocks(arrays: dict, workers: int) -> list:
+    # Wide frames are split by column groups, narrow ones by row ranges (Arrow slices are zero-copy)
+    cols = list(arrays)
+    if len(cols) >= workers:
+        return [pa.table({col: arrays[col] for col in cols[i::workers]}) for i in range(workers)]
+    table = pa.table(arrays)
+    bounds = np.linspace(0, table.num_rows, workers + 1, dtype=int)
+    return [table.slice(start, end - start) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Shared worker pool for the whole app, started on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned workers: forking a multithreaded server process is unsafe
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _discard_process_pool(pool: ProcessPoolExecutor):
+    # A dead worker (e.g. killed for memory) breaks the whole pool; drop it so the next call starts a fresh one
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+def _run_blocks(pool: ProcessPoolExecutor, func, names: list):
+    # Retried once on a fresh pool when the given one is (or becomes) broken
+    for attempt in range(2):
+        try:
+            list(pool.map(partial(_clean_shared_block, func), names))
+            return
+        except BrokenProcessPool:
+            _discard_process_pool(pool)
+            for name in names:
+                _unlink_shared(f"{name}_out")
+            if attempt:
+                raise
+            pool = get_process_pool()
+
+def apply_columnwise(df: pd.DataFrame, func, pool: ProcessPoolExecutor = None, workers: int = 1, columns: list = None):
+    """Applies a per-column cleaning function to the string columns of df (or just `columns`), in parallel when a pool is given"""
+    string_cols = list(df.select_dtypes(include=["object"]).columns)
+    if columns is not None:
+        string_cols = [col for col in string_cols if col in columns]
+    if pool is None or workers <= 1 or not string_cols or len(df) == 0:
+        return func(df)
+
+    # Only the columns the step touches are shipped to the workers, everything else stays put
+    arrays = _to_arrow_columns(df, string_cols)
+    leftover = [col for col in string_cols if col not in arrays]
+    if leftover:
+        cleaned = func(df[leftover].copy())
+        for col in leftover:
+            df[col] = cleaned[col].to_numpy()
+
+    names = []
+    try:
+        for block in _split_blocks(arrays, workers) if arrays else []:
+            names.append(_write_shared(block))
+        _run_blocks(pool, func, names)
+        blocks = [_read_shared(f"{name}_out") for name in names]
+    finally:
+        for name in names:
+            _unlink_shared(name)
+            _unlink_shared(f"{name}_out")
+
+    # Each column is put back as one array: its only block, or its row ranges joined in order
+    for col in arrays:
+        parts = [block[col].to_numpy(dtype=object) for block in blocks if col in block.columns]
+        values = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        values[pd.isna(values)] = np.nan  # Arrow nulls come back as None
+        df[col] = values
+    return df
+
 # Cleaning agent using the three main points
 class MockCleaningAgent:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, workers: int = 1, near_duplicates: dict = None, impute: dict = None):
         self.df = df
+        self.workers = max(1, workers)
+        self.pool = None
+        self.stats = {}  # Per-step metrics reported back with the run
+
+        @tool
+        def type_coercer(input: str) -> str:
+            """Converts date, numeric and boolean-looking string columns to typed columns"""
+            report = self.stats.setdefault("types_coerced", {})
+            coerce_types(self.df, report)
+            return f"✅ {len(report)} columns converted to typed values"
 
         @tool
         def missing_value_tool(input: str) -> str:
             """Fills missing values in string columns with 'Unknown', keeps numeric NaN"""
-            fill_missing_values(self.df)
+            self.df = apply_columnwise(self.df, fill_missing_values, self.pool, self.workers)
             return "✅ Missing values handled ('Unknown' for strings, NaN for numeric)"
 
+        @tool
+        def numeric_imputer(input: str) -> str:
+            """Fills numeric NaN per column (mean, median, mode, constant or ffill) using streaming statistics"""
+            # Stats are gathered block by block, the same way the chunked pipeline does it
+            col_stats = fit_numeric_stats(iter_blocks(self.df), impute)
+            report = {}
+            impute_numeric(self.df, impute, col_stats, report)
+            self.stats["numeric_imputed"] = finalize_report(report)
+            return f"✅ Numeric missing values imputed in {len(report)} columns"
+
         @tool
         def duplicate_remover(input: str) -> str:
             """Removes duplicate rows based on email + signup_date"""
@@ -45,24 +282,44 @@ class MockCleaningAgent:
         @tool
         def format_normalizer(input: str) -> str:
             """Normalizes string columns (capitalize names, lowercase emails)"""
-            normalize_strings(self.df)
+            self.df = apply_columnwise(self.df, normalize_strings, self.pool, self.workers, NORMALIZED_COLUMNS)
             return "✅ String columns normalized"
 
-        self.tools = [missing_value_tool, duplicate_remover, format_normalizer]
+        @tool
+        def near_duplicate_remover(input: str) -> str:
+            """Merges near-duplicate rows (fuzzy match per column, sorted-neighbourhood blocking)"""
+            self.df, report = remove_near_duplicates(self.df, near_duplicates)
+            self.stats["near_duplicates_merged"] = report
+            return f"✅ {report['removed_count']} near-duplicate rows merged into {report['cluster_count']} clusters"
 
-    def run(self, prompt: str):
-        print("🤖 AI Agent Starting Data Cleaning Process...\n")
-        results = []
+        self.tools = [type_coercer, missing_value_tool, duplicate_remover, format_normalizer]
+        # Numeric NaN are only imputed when the request asks for it
+        if impute:
+            self.tools.insert(2, numeric_imputer)
+        # Fuzzy matching is opt-in: it is the only step that compares rows with each other
+        if near_duplicates is not None:
+            self.tools.append(near_duplicate_remover)
+
+    def iter_steps(self):
+        """Runs the tools one at a time, yielding (step number, tool, result) after each one"""
+        # The app-wide pool is reused; workers only limits how many blocks a step is split into
+        if self.workers > 1:
+            self.pool = get_process_pool()
+            print(f"⚡ Parallel mode: {self.workers} worker processes\n")
 
         for i, tool in enumerate(self.tools, 1):
             print(f"📋 Step {i}: Using {tool.name} - {tool.description}")
             result = tool.invoke("execute")
-            results.append(result)
             print(f"   {result}\n")
+            yield i, tool, result
+
+    def run(self, prompt: str):
+        print("🤖 AI Agent Starting Data Cleaning Process...\n")
+        results = [result for _, _, result in self.iter_steps()]
 
         print("✨ All data cleaning operations completed successfully!\n")
         return self.df
 
 # Function to get the cleaning agent
-def get_cleaning_agent(df: pd.DataFrame):
-    return MockCleaningAgent(df)
+def get_cleaning_agent(df: pd.DataFrame, workers: int = 1, near_duplicates: dict = None, impute: dict = None):
+    return MockCleaningAgent(df, workers=workers, near_duplicates=near_duplicates, impute=impute)
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+STRATEGIES = ("mean", "median", "mode", "constant", "ffill")
+SKETCH_SIZE = 256  # Items per sketch level; median rank error is roughly 1 / SKETCH_SIZE
+MODE_CAPACITY = 1024  # Distinct values tracked for the approximate mode
+BLOCK_ROWS = 50_000  # Rows fed to the sketches at a time for in-memory frames
+
+class QuantileSketch:
+    """KLL-style quantile sketch: bounded memory, updated a batch at a time"""
+
+    def __init__(self, k: int = SKETCH_SIZE, seed: int = 0):
+        self.k = k
+        self.levels = [np.empty(0)]  # Items at level h stand for 2**h values
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+
+    def _compact(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.k:
+                level = np.sort(level)
+                # Keep every other item (random offset) at double weight, leave an odd one behind
+                pairs = len(level) // 2 * 2
+                promoted = level[self.rng.integers(0, 2):pairs:2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.levels[h] = level[pairs:]
+            h += 1
+
+    def quantile(self, q: float) -> float:
+        items = np.concatenate(self.levels)
+        if items.size == 0:
+            return np.nan
+        weights = np.concatenate([np.full(len(level), 2 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items)
+        cumulative = np.cumsum(weights[order])
+        return float(items[order][np.searchsorted(cumulative, q * cumulative[-1])])
+
+class StreamingColumnStats:
+    """Mean, approximate median and approximate mode of one numeric column, fed chunk by chunk"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.sketch = QuantileSketch()
+        self.counts = {}  # Misra-Gries style counters for the mode
+
+    def update(self, values: pd.Series):
+        values = pd.to_numeric(values, errors="coerce").dropna().astype(float)
+        if values.empty:
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.sketch.update(values.to_numpy())
+
+        for value, n in values.value_counts().items():
+            self.counts[value] = self.counts.get(value, 0) + int(n)
+        if len(self.counts) > MODE_CAPACITY:
+            # Subtract the (capacity + 1)-th largest count so only heavy hitters survive
+            ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+            cut = ranked[MODE_CAPACITY][1]
+            survivors = {v: n - cut for v, n in self.counts.items() if n > cut}
+            # With many equally common values (a continuous column) nothing survives the cut;
+            # the leading candidate is kept so the mode stays defined
+            self.counts = survivors or {ranked[0][0]: 1}
+
+    def value(self, strategy: str) -> float:
+        if self.count == 0:
+            return np.nan
+        if strategy == "mean":
+            return self.total / self.count
+        if strategy == "median":
+            return self.sketch.quantile(0.5)
+        if strategy == "mode":
+            return max(self.counts, key=self.counts.get) if self.counts else np.nan
+        raise ValueError(f"Strategy '{strategy}' has no statistic")
+
+def parse_strategies(spec: str) -> dict:
+    """Parses 'age:median,score:constant=0,temp:ffill' into {col: (strategy, constant)}"""
+    strategies = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        col, _, strategy = item.partition(":")
+        strategy, _, constant = strategy.strip().partition("=")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown imputation strategy '{strategy}' for column '{col.strip()}'")
+        if strategy == "constant":
+            try:
+                constant = float(constant)
+            except ValueError:
+                raise ValueError(f"Constant imputation for column '{col.strip()}' needs a number, e.g. {col.strip()}:constant=0")
+        strategies[col.strip()] = (strategy, constant if strategy == "constant" else None)
+    return strategies
+
+def fit_numeric_stats(chunks, strategies: dict) -> dict:
+    """One streaming pass over DataFrame chunks, collecting stats for columns imputed by mean/median/mode"""
+    stats = {col: StreamingColumnStats() for col, (strategy, _) in strategies.items() if strategy in ("mean", "median", "mode")}
+    for chunk in chunks:
+        for col, col_stats in stats.items():
+            if col in chunk.columns:
+                col_stats.update(chunk[col])
+    return stats
+
+def iter_blocks(df: pd.DataFrame, rows: int = BLOCK_ROWS):
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+# 5️⃣ Impute numeric missing values
+def impute_numeric(df: pd.DataFrame, strategies: dict, stats: dict, report: dict = None):
+    """Fills numeric NaN per column using precomputed stats; report keeps the value used and the count filled"""
+    report = {} if report is None else report
+    for col, (strategy, constant) in strategies.items():
+        if col not in df.columns or not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        entry = report.setdefault(col, {"strategy": strategy, "value": None, "filled_count": 0})
+        missing = int(df[col].isna().sum())
+
+        if strategy == "ffill":
+            # Carry the last seen value over from the previous chunk
+            last = entry.pop("_last", np.nan)
+            filled = df[col].ffill()
+            if missing and pd.notna(last):
+                filled = filled.fillna(last)
+            non_null = filled.dropna()
+            entry["_last"] = non_null.iloc[-1] if len(non_null) else last
+        else:
+            value = constant if strategy == "constant" else stats[col].value(strategy)
+            if pd.isna(value):
+                # Only possible when the column has no numeric values at all; say so instead of reporting 0 filled
+                entry["note"] = f"no {strategy} found: the column has no numeric values"
+            entry["value"] = None if pd.isna(value) else float(value)
+            filled = df[col].fillna(value)
+
+        entry["filled_count"] += missing - int(filled.isna().sum())
+        df[col] = filled
+    return df
+
+def finalize_report(report: dict) -> dict:
+    # Drop the internal ffill carry before the report is stored
+    for entry in report.values():
+        entry.pop("_last", None)
+    return report
@@ -0,0 +1,94 @@
+from difflib import SequenceMatcher
+import pandas as pd
+import numpy as np
+
+# Default per-column similarity thresholds (0-1) for the near-duplicate step; 1 means an exact match
+# (after case / whitespace normalization). Emails differing in a single digit ("user1@" / "user10@") are
+# different people, so by default only names are matched fuzzily, within rows sharing an email.
+DEFAULT_THRESHOLDS = {"email": 1.0, "name": 0.85}
+DEFAULT_WINDOW = 5  # Sorted-neighbourhood window size
+MAX_REPORTED_CLUSTERS = 50  # Clusters listed in the run report
+
+def _normalize(series: pd.Series) -> np.ndarray:
+    # Case, surrounding and repeated whitespace never make two rows different
+    values = series.fillna("").astype(str).str.lower().str.strip()
+    return values.str.replace(r"\s+", " ", regex=True).to_numpy(dtype=object)
+
+def _similarity(a: str, b: str, threshold: float) -> bool:
+    if a == b:
+        return True
+    if threshold >= 1:
+        return False
+    if not a or not b:
+        return False
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # Cheap upper bounds first, full ratio only when they pass
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
+
+def _find(parent: list, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def find_near_duplicates(df: pd.DataFrame, thresholds: dict = None, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """Returns a cluster id per row; rows sharing an id are near-duplicates of each other"""
+    thresholds = {col: t for col, t in (thresholds or DEFAULT_THRESHOLDS).items() if col in df.columns}
+    n = len(df)
+    parent = list(range(n))
+    if not thresholds or n < 2:
+        return np.array(parent)
+
+    columns = {col: _normalize(df[col]) for col in thresholds}
+
+    # Exact-match columns form a blocking key: only rows sharing it (and not missing it) are ever compared
+    exact = [col for col, t in thresholds.items() if t >= 1]
+    fuzzy = {col: t for col, t in thresholds.items() if t < 1}
+    block = None
+    if exact:
+        block = columns[exact[0]].copy()
+        for col in exact[1:]:
+            block = block + "\x00" + columns[col]
+        has_block = np.all([columns[col] != "" for col in exact], axis=0)
+
+    # One sorted-neighbourhood pass per fuzzy column (sorted within blocks), so each row is
+    # compared only with its window-1 neighbours (O(n * window) pairs)
+    for key_col in fuzzy or exact[:1]:
+        sort_key = columns[key_col] if block is None else block + "\x00" + columns[key_col]
+        order = np.argsort(sort_key, kind="stable")
+        for offset in range(1, window):
+            left, right = order[:-offset], order[offset:]
+            for i, j in zip(left.tolist(), right.tolist()):
+                if block is not None and not (has_block[i] and block[i] == block[j]):
+                    continue
+                root_i, root_j = _find(parent, i), _find(parent, j)
+                if root_i == root_j:
+                    continue
+                if all(_similarity(columns[col][i], columns[col][j], t) for col, t in fuzzy.items()):
+                    # Smallest row index becomes the cluster root, so the first occurrence is kept
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    return np.array([_find(parent, i) for i in range(n)])
+
+# 4️⃣ Remove near-duplicates
+def remove_near_duplicates(df: pd.DataFrame, thresholds: dict = None, window: int = DEFAULT_WINDOW):
+    """Drops near-duplicate rows, keeping the first row of each cluster; returns (df, report)"""
+    clusters = find_near_duplicates(df, thresholds, window)
+    keep = clusters == np.arange(len(df))
+
+    merged = pd.Series(np.arange(len(df)))[~keep].groupby(clusters[~keep]).apply(list)
+    report = {
+        "thresholds": {col: t for col, t in (thresholds or DEFAULT_THRESHOLDS).items() if col in df.columns},
+        "window": window,
+        "removed_count": int((~keep).sum()),
+        "cluster_count": len(merged),
+        "clusters": [
+            {"kept_row": int(root), "merged_rows": [int(i) for i in rows]}
+            for root, rows in merged.head(MAX_REPORTED_CLUSTERS).items()
+        ],
+    }
+    return df[keep].reset_index(drop=True), report
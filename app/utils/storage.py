@@ -0,0 +1,331 @@
+import hashlib
+import io
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# Storage configuration (environment variables)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")  # "local" or "s3"
+LOCAL_STORAGE_ROOT = os.getenv("LOCAL_STORAGE_ROOT", "app/static")
+S3_BUCKET = os.getenv("S3_BUCKET", "cleaning-data")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # e.g. http://localhost:9000 for MinIO or moto_server
+STORAGE_CACHE_DIR = os.getenv("STORAGE_CACHE_DIR", "/tmp/cleaning_cache")
+STORAGE_CACHE_MAX_BYTES = int(os.getenv("STORAGE_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+STORAGE_CACHE_GRACE_SECONDS = int(os.getenv("STORAGE_CACHE_GRACE_SECONDS", "60"))  # Recently used files are never evicted
+
+READ_CHUNK_BYTES = 1024 * 1024
+MULTIPART_PART_BYTES = 8 * 1024 * 1024  # S3 needs at least 5 MB per part (except the last one)
+
+class StorageBackend:
+    """Object-store style interface: files are addressed by key ("uploads/<name>", "cleaned/<name>")"""
+
+    def open_write(self, key: str):
+        """Context manager yielding a binary writer; the object only appears once the block exits cleanly"""
+        raise NotImplementedError
+
+    def open_read(self, key: str):
+        raise NotImplementedError
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        """Reads bytes [start, end) of an object"""
+        raise NotImplementedError
+
+    def local_copy(self, key: str):
+        """Context manager yielding the path of a local copy of the object, for readers that need a real file (pandas).
+        The copy is guaranteed to exist until the block exits."""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def write_bytes(self, key: str, data: bytes):
+        with self.open_write(key) as writer:
+            writer.write(data)
+
+    def iter_chunks(self, key: str, chunk_size: int = READ_CHUNK_BYTES):
+        with self.open_read(key) as f:
+            for block in iter(lambda: f.read(chunk_size), b""):
+                yield block
+
+class LocalStorage(StorageBackend):
+    """Keys map to files under a root directory"""
+
+    def __init__(self, root: str = LOCAL_STORAGE_ROOT):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        # Records created before the storage layer hold full paths under the root
+        if key.startswith(self.root.rstrip("/") + "/"):
+            return key
+        return os.path.join(self.root, key)
+
+    @contextmanager
+    def open_write(self, key: str):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            with open(tmp_path, "wb") as f:
+                yield f
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def open_read(self, key: str):
+        return open(self._path(key), "rb")
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        with open(self._path(key), "rb") as f:
+            f.seek(start)
+            return f.read(max(end - start, 0))
+
+    @contextmanager
+    def local_copy(self, key: str):
+        yield self._path(key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self._path(key))
+
+    def delete(self, key: str):
+        if self.exists(key):
+            os.remove(self._path(key))
+
+class _S3MultipartWriter(io.RawIOBase):
+    # Buffers writes into parts; small objects fall back to a single put_object
+    def __init__(self, client, bucket: str, key: str, part_bytes: int = MULTIPART_PART_BYTES):
+        self.client, self.bucket, self.key = client, bucket, key
+        self.part_bytes = part_bytes
+        self.buffer = bytearray()
+        self.upload_id = None
+        self.parts = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.buffer.extend(data)
+        while len(self.buffer) >= self.part_bytes:
+            self._upload_part(bytes(self.buffer[:self.part_bytes]))
+            del self.buffer[:self.part_bytes]
+        return len(data)
+
+    def _upload_part(self, body: bytes):
+        if self.upload_id is None:
+            self.upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key)["UploadId"]
+        number = len(self.parts) + 1
+        response = self.client.upload_part(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=number, Body=body)
+        self.parts.append({"PartNumber": number, "ETag": response["ETag"]})
+
+    def complete(self):
+        if self.upload_id is None:
+            self.client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self.buffer))
+        else:
+            if self.buffer:
+                self._upload_part(bytes(self.buffer))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, MultipartUpload={"Parts": self.parts}
+            )
+        self.buffer.clear()
+
+    def abort(self):
+        if self.upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+        self.buffer.clear()
+
+class S3Storage(StorageBackend):
+    """S3-compatible object store (AWS, MinIO, or moto_server as a local stand-in via endpoint_url)"""
+
+    def __init__(self, bucket: str = S3_BUCKET, endpoint_url: str = S3_ENDPOINT_URL, client=None, part_bytes: int = MULTIPART_PART_BYTES):
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError("STORAGE_BACKEND=s3 needs boto3 installed (pip install boto3)")
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.client = client
+        self.bucket = bucket
+        self.part_bytes = part_bytes
+
+    @contextmanager
+    def open_write(self, key: str):
+        writer = _S3MultipartWriter(self.client, self.bucket, key, self.part_bytes)
+        try:
+            yield writer
+        except BaseException:
+            writer.abort()
+            raise
+        writer.complete()
+
+    def open_read(self, key: str):
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        if end <= start:
+            return b""
+        response = self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end - 1}")
+        return response["Body"].read()
+
+    def local_copy(self, key: str):
+        raise NotImplementedError("S3Storage has no local files; wrap it in CachedStorage")
+
+    def iter_chunks(self, key: str, chunk_size: int = READ_CHUNK_BYTES):
+        yield from self.open_read(key).iter_chunks(chunk_size)
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+class CachedStorage(StorageBackend):
+    """Read-through local disk cache in front of a remote backend, evicting least recently used files.
+
+    The cache directory itself is the index: files are named after their key, their mtime is the
+    last use, and the size cap is checked against a scan of the directory. That way the index
+    survives restarts and the cap holds for every worker process sharing the directory.
+    """
+
+    def __init__(self, backend: StorageBackend, cache_dir: str = STORAGE_CACHE_DIR, max_bytes: int = STORAGE_CACHE_MAX_BYTES,
+                 grace_seconds: int = STORAGE_CACHE_GRACE_SECONDS):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.grace_seconds = grace_seconds
+        self.pins = {}  # cache path -> number of open local_copy blocks in this process
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        # Files left by a previous run count towards the cap straight away
+        self._evict()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def _scan(self) -> list:
+        # (last use, size, path) of every complete cache file, oldest first
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".part"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return sorted(files)
+
+    def _evict(self):
+        with self.lock:
+            pinned = set(self.pins)
+        files = self._scan()
+        total = sum(size for _, size, _ in files)
+        now = time.time()
+        for mtime, size, path in files:
+            if total <= self.max_bytes:
+                break
+            # Skip files in use here, and files another worker touched moments ago (likely in use there)
+            if path in pinned or now - mtime < self.grace_seconds:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _forget(self, key: str):
+        try:
+            os.remove(self._cache_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _fetch(self, key: str, path: str):
+        try:
+            os.utime(path)  # Cache hit: mark as most recently used
+            return
+        except FileNotFoundError:
+            pass
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            with open(tmp_path, "wb") as f:
+                for block in self.backend.iter_chunks(key):
+                    f.write(block)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @contextmanager
+    def local_copy(self, key: str):
+        path = self._cache_path(key)
+        # Pin first so a concurrent eviction can never remove the copy handed out below
+        with self.lock:
+            self.pins[path] = self.pins.get(path, 0) + 1
+        try:
+            self._fetch(key, path)
+            self._evict()
+            yield path
+        finally:
+            with self.lock:
+                self.pins[path] -= 1
+                if not self.pins[path]:
+                    del self.pins[path]
+
+    @contextmanager
+    def open_write(self, key: str):
+        self._forget(key)
+        with self.backend.open_write(key) as writer:
+            yield writer
+
+    def open_read(self, key: str):
+        # An open handle stays readable even if the file is evicted afterwards
+        with self.local_copy(key) as path:
+            return open(path, "rb")
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        # Hot files come from the cache, cold ones are fetched range by range without caching
+        try:
+            with open(self._cache_path(key), "rb") as f:
+                f.seek(start)
+                return f.read(max(end - start, 0))
+        except FileNotFoundError:
+            return self.backend.read_range(key, start, end)
+
+    def exists(self, key: str) -> bool:
+        return self.backend.exists(key)
+
+    def size(self, key: str) -> int:
+        return self.backend.size(key)
+
+    def delete(self, key: str):
+        self._forget(key)
+        self.backend.delete(key)
+
+def get_storage() -> StorageBackend:
+    if STORAGE_BACKEND == "s3":
+        return CachedStorage(S3Storage())
+    if STORAGE_BACKEND == "local":
+        return LocalStorage()
+    raise RuntimeError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}' (expected 'local' or 's3')")
+
+# Shared instance used by the routes
+storage = get_storage()
@@ -0,0 +1,58 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("langchain")
+
+from app.utils.cleaning_tools import (
+    apply_columnwise, fill_missing_values, normalize_strings, get_process_pool, shutdown_process_pool,
+    clean_chunks, read_csv_chunks,
+)
+
+@pytest.fixture(scope="module")
+def pool():
+    yield get_process_pool()
+    shutdown_process_pool()
+
+def make_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "name": [" ann lee", np.nan, "BOB smith", "cy"],
+        "email": ["A@X.COM ", "b@x.com", np.nan, "c@x.com"],
+        "mixed": [1, "a", np.nan, "b"],  # Not all strings, so it stays in the parent process
+        "empty": [np.nan, np.nan, np.nan, np.nan],
+        "age": [1.0, np.nan, 3.0, 4.0],
+    }, index=[5, 7, 9, 11]).astype({"empty": object})
+
+@pytest.mark.parametrize("workers", [2, 3, 8])
+@pytest.mark.parametrize("func", [fill_missing_values, normalize_strings])
+def test_parallel_matches_serial(pool, func, workers):
+    # 2 and 3 workers split by column groups, 8 by row ranges
+    expected = func(make_df())
+    result = apply_columnwise(make_df(), func, pool, workers)
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_broken_pool_is_replaced(pool):
+    # A worker dying (e.g. out of memory) breaks the pool; the next call must start a fresh one
+    with pytest.raises(Exception):
+        pool.submit(os._exit, 1).result()
+    result = apply_columnwise(make_df(), fill_missing_values, pool, 2)
+    assert result["name"].tolist()[1] == "Unknown"
+    assert get_process_pool() is not pool
+
+def test_chunks_keep_first_chunk_dtypes(tmp_path):
+    # "notes" is empty and "age" has a gap in the second chunk; pandas alone would re-type both there
+    path = tmp_path / "sparse.csv"
+    path.write_text(
+        "email,signup_date,name,notes,age\n"
+        "a@x.com,2024-01-01,ann,hi,30\nb@x.com,2024-01-02,bob,hi,31\nc@x.com,2024-01-03,cy,hi,32\n"
+        "d@x.com,2024-01-04,dee,,33\ne@x.com,2024-01-05,eve,,\nf@x.com,2024-01-06,fay,,35\n"
+    )
+    stats = {}
+    chunks = list(clean_chunks(read_csv_chunks(str(path), 3), stats))
+
+    assert [chunk["notes"].tolist() for chunk in chunks] == [["hi"] * 3, ["Unknown"] * 3]
+    assert stats["filled_count"]["notes"] == 3
+    text = "".join(chunk.to_csv(index=False, header=False, na_rep="NaN") for chunk in chunks)
+    assert [line.rsplit(",", 1)[1] for line in text.splitlines()] == ["30.0", "31.0", "32.0", "33.0", "NaN", "35.0"]
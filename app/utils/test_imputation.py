@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.imputation import MODE_CAPACITY, StreamingColumnStats, fit_numeric_stats, impute_numeric, iter_blocks
+
+def test_mode_survives_a_continuous_column():
+    # More distinct values than counters, all equally common: every counter ties at the cut
+    stats = StreamingColumnStats()
+    for block in np.array_split(np.random.default_rng(0).random(MODE_CAPACITY * 20), 10):
+        stats.update(pd.Series(block))
+    assert not np.isnan(stats.value("mode"))
+
+def test_mode_finds_a_heavy_hitter():
+    values = np.concatenate([np.arange(MODE_CAPACITY * 5, dtype=float), np.full(500, 7.5)])
+    np.random.default_rng(0).shuffle(values)
+    stats = StreamingColumnStats()
+    for block in np.array_split(values, 8):
+        stats.update(pd.Series(block))
+    assert stats.value("mode") == 7.5
+
+def test_missing_statistic_is_reported():
+    df = pd.DataFrame({"age": [np.nan, np.nan], "score": [1.0, np.nan]})
+    strategies = {"age": ("mode", None), "score": ("mode", None)}
+    report = {}
+    impute_numeric(df, strategies, fit_numeric_stats(iter_blocks(df), strategies), report)
+    assert report["age"]["filled_count"] == 0
+    assert "no numeric values" in report["age"]["note"]
+    assert report["score"] == {"strategy": "mode", "value": 1.0, "filled_count": 1}
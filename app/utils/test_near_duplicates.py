@@ -0,0 +1,22 @@
+import pandas as pd
+
+from app.utils.near_duplicates import find_near_duplicates, remove_near_duplicates
+
+def test_ids_differing_in_a_digit_are_not_merged():
+    df = pd.DataFrame({
+        "email": ["user1.7919@example.com", "user10.79190@example.com", " USER1.7919@EXAMPLE.COM "],
+        "name": ["person 1 surname1", "person 10 surname10", "person 1 surnxme1"],
+    })
+    assert find_near_duplicates(df).tolist() == [0, 1, 0]
+
+def test_rows_missing_the_blocking_key_are_kept():
+    df = pd.DataFrame({"email": [None, None], "name": ["ann lee", "ann lee"]})
+    cleaned, report = remove_near_duplicates(df)
+    assert len(cleaned) == 2
+    assert report["removed_count"] == 0
+
+def test_fuzzy_only_thresholds():
+    df = pd.DataFrame({"email": ["a@x.com", "b@y.com"], "name": ["Jonathan Smith", "jonathan  smyth"]})
+    cleaned, report = remove_near_duplicates(df, {"name": 0.85})
+    assert cleaned["email"].tolist() == ["a@x.com"]
+    assert report["clusters"] == [{"kept_row": 0, "merged_rows": [1]}]
@@ -0,0 +1,110 @@
+import os
+import time
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto_server = pytest.importorskip("moto.server")
+
+from app.utils.storage import S3Storage, CachedStorage, LocalStorage
+
+BUCKET = "cleaning-test"
+PART = 5 * 1024 * 1024  # Smallest part size S3 accepts
+
+# S3 backend tested against moto's threaded server as a local stand-in for S3
+@pytest.fixture(scope="module")
+def endpoint():
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+@pytest.fixture
+def s3(endpoint, monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    client = boto3.client("s3", endpoint_url=endpoint)
+    client.create_bucket(Bucket=BUCKET)
+    yield S3Storage(bucket=BUCKET, client=client, part_bytes=PART)
+    for obj in client.list_objects_v2(Bucket=BUCKET).get("Contents", []):
+        client.delete_object(Bucket=BUCKET, Key=obj["Key"])
+    client.delete_bucket(Bucket=BUCKET)
+
+def test_multipart_write_and_ranged_read(s3):
+    data = os.urandom(2 * PART + 1234)
+
+    with s3.open_write("uploads/big.csv") as writer:
+        for start in range(0, len(data), 1024 * 1024):
+            writer.write(data[start:start + 1024 * 1024])
+        assert len(writer.parts) == 2  # Two full parts uploaded while streaming
+
+    head = s3.client.head_object(Bucket=BUCKET, Key="uploads/big.csv")
+    assert head["ContentLength"] == len(data)
+    assert head["ETag"].strip('"').endswith("-3")  # Completed as a 3-part multipart upload
+    assert s3.read_range("uploads/big.csv", PART - 10, PART + 10) == data[PART - 10:PART + 10]
+    assert s3.read_range("uploads/big.csv", 5, 5) == b""
+
+def test_failed_write_leaves_no_object(s3):
+    with pytest.raises(RuntimeError):
+        with s3.open_write("uploads/broken.csv") as writer:
+            writer.write(b"a,b\n")
+            raise RuntimeError("upload interrupted")
+    assert not s3.exists("uploads/broken.csv")
+
+def test_small_write_and_delete(s3):
+    s3.write_bytes("cleaned/small.csv", b"a,b\n1,2\n")
+    assert s3.exists("cleaned/small.csv")
+    assert s3.size("cleaned/small.csv") == 8
+    assert b"".join(s3.iter_chunks("cleaned/small.csv", chunk_size=3)) == b"a,b\n1,2\n"
+    s3.delete("cleaned/small.csv")
+    assert not s3.exists("cleaned/small.csv")
+
+def test_cache_reads_through_and_evicts_least_recently_used(s3, tmp_path):
+    for name in ("a", "b", "c"):
+        s3.write_bytes(f"cleaned/{name}.csv", name.encode() * 1000)
+    cache = CachedStorage(s3, cache_dir=str(tmp_path), max_bytes=2500, grace_seconds=0)
+
+    with cache.local_copy("cleaned/a.csv") as path_a:
+        assert open(path_a, "rb").read() == b"a" * 1000
+    time.sleep(0.01)
+    with cache.local_copy("cleaned/b.csv") as path_b:
+        pass
+    time.sleep(0.01)
+    with cache.local_copy("cleaned/c.csv") as path_c:
+        pass
+
+    # Over the cap: the oldest file goes, the newer ones stay
+    assert not os.path.exists(path_a)
+    assert os.path.exists(path_b) and os.path.exists(path_c)
+    assert cache.read_range("cleaned/b.csv", 10, 20) == b"b" * 10
+
+def test_cache_never_evicts_pinned_copies(s3, tmp_path):
+    for name in ("a", "b"):
+        s3.write_bytes(f"cleaned/{name}.csv", name.encode() * 1000)
+    cache = CachedStorage(s3, cache_dir=str(tmp_path), max_bytes=1500, grace_seconds=0)
+
+    with cache.local_copy("cleaned/a.csv") as path_a:
+        time.sleep(0.01)
+        with cache.local_copy("cleaned/b.csv") as path_b:
+            # Both are in use, so neither can be evicted even though the cap is exceeded
+            assert open(path_a, "rb").read() == b"a" * 1000
+            assert open(path_b, "rb").read() == b"b" * 1000
+
+def test_cache_index_rebuilt_from_disk(s3, tmp_path):
+    s3.write_bytes("cleaned/a.csv", b"a" * 1000)
+    with CachedStorage(s3, cache_dir=str(tmp_path), grace_seconds=0).local_copy("cleaned/a.csv") as path_a:
+        pass
+
+    # A new instance (restart or another worker) sees the file and enforces a smaller cap at once
+    CachedStorage(s3, cache_dir=str(tmp_path), max_bytes=500, grace_seconds=0)
+    assert not os.path.exists(path_a)
+
+def test_local_storage_accepts_legacy_paths(tmp_path):
+    local = LocalStorage(root=str(tmp_path))
+    local.write_bytes("uploads/x.csv", b"a,b\n")
+    legacy = os.path.join(str(tmp_path), "uploads", "x.csv")
+    assert local.exists(legacy)
+    with local.local_copy("uploads/x.csv") as path:
+        assert path == legacy
+    assert local.read_range("uploads/x.csv", 2, 4) == b"b\n"
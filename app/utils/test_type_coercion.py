@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from app.utils import type_coercion
+from app.utils.type_coercion import coerce_types
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    type_coercion._format_cache.clear()
+    yield
+    type_coercion._format_cache.clear()
+
+def test_day_month_order_never_comes_from_another_file():
+    coerce_types(pd.DataFrame({"signup_date": ["25/12/2024", "24/12/2024"]}))
+
+    report = {}
+    df = coerce_types(pd.DataFrame({"signup_date": ["12/25/2024", "01/13/2024", "01/02/2024"]}), report)
+    assert report["signup_date"]["formats"] == ["%m/%d/%Y"]
+    assert df["signup_date"].tolist() == [pd.Timestamp("2024-12-25"), pd.Timestamp("2024-01-13"), pd.Timestamp("2024-01-02")]
+    assert df["signup_date_unparsed"].isna().all()
+
+def test_cached_format_is_rechecked_against_the_sample():
+    coerce_types(pd.DataFrame({"answer": ["yes", "no", "yes"]}))
+    report = {}
+    df = coerce_types(pd.DataFrame({"answer": ["maybe", "later", "never"]}), report)
+    assert report == {}
+    assert df["answer"].tolist() == ["maybe", "later", "never"]
+
+def test_zero_padded_codes_do_not_reuse_a_numeric_format():
+    coerce_types(pd.DataFrame({"zip": ["12345", "54321"]}))
+    df = coerce_types(pd.DataFrame({"zip": ["01234", "04321"]}))
+    assert df["zip"].tolist() == ["01234", "04321"]
+
+def test_unparseable_values_are_kept():
+    report = {}
+    df = coerce_types(pd.DataFrame({"age": ["31", "32", "33", "34", "35", "36", "37", "38", "39", "forty"]}), report)
+    assert df["age"].isna().sum() == 1
+    assert df["age_unparsed"].dropna().tolist() == ["forty"]
+    assert report["age"]["unparseable_count"] == 1
+    assert report["age"]["unparseable_examples"] == ["forty"]
+
+def test_whole_and_chunked_runs_get_the_same_columns():
+    rows = pd.DataFrame({"signup_date": ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"], "name": ["a", "b", "c", "d"]})
+    whole = coerce_types(rows.copy())
+    formats = {}
+    chunks = [coerce_types(rows.iloc[i:i + 2].copy(), formats=formats) for i in (0, 2)]
+    assert list(whole.columns) == ["signup_date", "signup_date_unparsed", "name"]
+    assert all(list(chunk.columns) == list(whole.columns) for chunk in chunks)
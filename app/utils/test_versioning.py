@@ -0,0 +1,72 @@
+import io
+
+from app.utils.versioning import build_delta, load_version, diff_versions, read_rows
+
+BASE_CSV = (
+    "id,name,city\n"
+    "1,Ann Lee,\"Paris, FR\"\n"
+    "2,Bob,NaN\n"
+    "2,Bob,NaN\n"  # Duplicate base row
+    "3,\"Cy \"\"The Kid\"\"\",Oslo\n"
+    "4,Dee,\n"
+)
+
+def store(tmp_path, name: str, data) -> str:
+    path = tmp_path / name
+    if isinstance(data, bytes):
+        path.write_bytes(data)
+    else:
+        path.write_text(data)
+    return str(path)
+
+def rebuild(tmp_path, csv_text: str) -> str:
+    base_path = store(tmp_path, "base.csv", BASE_CSV)
+    delta = build_delta(base_path, csv_text)
+    assert delta is not None
+    delta_path = store(tmp_path, "new.delta.json.gz", delta)
+    return load_version(delta_path, base_path).to_csv(index=False)
+
+def test_delta_rebuilds_byte_for_byte(tmp_path):
+    new_csv = (
+        "id,name,city\n"
+        "4,Dee,\n"
+        "2,Bob,NaN\n"
+        "1,Ann Lee,\"Paris, FR\"\n"
+        "5,Eve,\"Rome, IT\"\n"  # Inserted
+        "2,Bob,NaN\n"
+        "3,Cy,Oslo\n"  # Changed
+    )
+    assert rebuild(tmp_path, new_csv) == new_csv
+
+def test_unchanged_version_with_duplicate_rows(tmp_path):
+    assert rebuild(tmp_path, BASE_CSV) == BASE_CSV
+
+def test_duplicate_base_rows_can_repeat_more_often(tmp_path):
+    new_csv = "id,name,city\n2,Bob,NaN\n2,Bob,NaN\n2,Bob,NaN\n"
+    assert rebuild(tmp_path, new_csv) == new_csv
+
+def test_changed_column_layout_falls_back_to_full_copy(tmp_path):
+    base_path = store(tmp_path, "base.csv", BASE_CSV)
+    assert build_delta(base_path, "id,name\n1,Ann Lee\n") is None
+    assert build_delta(base_path, "id,city,name\n1,\"Paris, FR\",Ann Lee\n") is None
+
+def test_full_copy_loads_as_text(tmp_path):
+    rows = load_version(store(tmp_path, "full.csv", BASE_CSV))
+    assert rows.to_csv(index=False) == BASE_CSV
+
+def test_diff_reports_changed_rows_by_key():
+    old = read_rows(io.StringIO(BASE_CSV))
+    new = read_rows(io.StringIO("id,name,city\n1,Ann Lee,\"Paris, FR\"\n3,Cy,Oslo\n4,Dee,\n5,Eve,Rome\n"))
+
+    diff = diff_versions(old, new, key="id")
+    assert diff["changed_count"] == 1
+    assert diff["changed"] == [{"id": "3", "changes": {"name": {"old": 'Cy "The Kid"', "new": "Cy"}}}]
+    assert diff["inserted_count"] == 1 and diff["inserted"] == [{"id": "5", "name": "Eve", "city": "Rome"}]
+    assert diff["deleted_count"] == 2  # Both copies of the Bob row
+    assert diff["unchanged_count"] == 2
+
+def test_diff_without_key_reports_edits_as_delete_and_insert():
+    old = read_rows(io.StringIO("id,name\n1,Ann\n2,Bob\n"))
+    new = read_rows(io.StringIO("id,name\n1,Ann\n2,Rob\n"))
+    diff = diff_versions(old, new)
+    assert (diff["inserted_count"], diff["deleted_count"], diff["changed_count"]) == (1, 1, 0)
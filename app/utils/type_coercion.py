@@ -0,0 +1,159 @@
+import re
+import pandas as pd
+
+SAMPLE_SIZE = 500  # Non-null values looked at when inferring a column's format
+MIN_PARSE_RATIO = 0.9  # Share of the sample that must parse for a column to be converted
+MAX_DATE_FORMATS = 3  # Formats tried one after another for columns with mixed date styles
+MAX_UNPARSEABLE_EXAMPLES = 20  # Unparseable values kept per column in the report
+MAX_CACHE_ENTRIES = 1024
+
+DATE_FORMATS = [
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y/%m/%d",
+    "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%m-%d-%Y", "%d.%m.%Y",
+    "%d %b %Y", "%b %d, %Y", "%d %B %Y", "%B %d, %Y",
+]
+# Day-first and month-first formats read the same ambiguous value differently, so a column never mixes them
+DAY_FIRST_FORMATS = {"%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y"}
+MONTH_FIRST_FORMATS = {"%m/%d/%Y", "%m-%d-%Y"}
+BOOLEAN_VALUES = {"true": True, "false": False, "yes": True, "no": False, "y": True, "n": False}
+
+# Column signature -> inferred format, so repeated files and chunks skip inference
+_format_cache = {}
+
+def _digits_shape(digits: str) -> str:
+    # Leading zeros are kept in the shape: zero-padded codes must not share a cache entry with plain numbers
+    return ("0" if len(digits) > 1 and digits[0] == "0" else "9") + "9" * (len(digits) - 1)
+
+def _shape(value: str) -> str:
+    # "2024-01-15" -> "9999-09-99", "Jan 5, 2024" -> "a 9, 9999"
+    return re.sub(r"[A-Za-z]+", "a", re.sub(r"\d+", lambda m: _digits_shape(m.group()), value))
+
+def _signature(col: str, sample: pd.Series) -> tuple:
+    return col, tuple(sorted(set(_shape(v) for v in sample.tolist())))
+
+def _parse_ratio(parsed: pd.Series) -> float:
+    return parsed.notna().mean() if len(parsed) else 0.0
+
+def infer_format(sample: pd.Series):
+    """Infers ("boolean" | "numeric" | "datetime", formats) for a sample of strings, or None to keep it as text"""
+    lowered = sample.str.strip().str.lower()
+    if lowered.isin(BOOLEAN_VALUES.keys()).mean() >= MIN_PARSE_RATIO:
+        return "boolean", ()
+
+    # Zero-padded codes (zip codes, ids) would lose their leading zeros as numbers
+    zero_padded = sample.str.strip().str.match(r"^0\d+$").any()
+    if not zero_padded and _parse_ratio(pd.to_numeric(sample.str.strip(), errors="coerce")) >= MIN_PARSE_RATIO:
+        return "numeric", ()
+
+    # Greedily pick the formats that together parse most of the sample
+    formats, remaining = [], sample.str.strip()
+    while len(remaining) and len(formats) < MAX_DATE_FORMATS:
+        best_format, best_parsed = None, None
+        excluded = set()
+        if DAY_FIRST_FORMATS & set(formats):
+            excluded = MONTH_FIRST_FORMATS
+        elif MONTH_FIRST_FORMATS & set(formats):
+            excluded = DAY_FIRST_FORMATS
+        for fmt in DATE_FORMATS:
+            if fmt in excluded:
+                continue
+            parsed = pd.to_datetime(remaining, format=fmt, errors="coerce")
+            if best_parsed is None or parsed.notna().sum() > best_parsed.notna().sum():
+                best_format, best_parsed = fmt, parsed
+        if best_parsed.notna().sum() == 0:
+            break
+        formats.append(best_format)
+        remaining = remaining[best_parsed.isna()]
+    if formats and 1 - len(remaining) / len(sample) >= MIN_PARSE_RATIO:
+        return "datetime", tuple(formats)
+    return None
+
+def _order_dependent(inferred) -> bool:
+    # Day-first vs month-first is decided by the values of the file at hand, never by another file's guess
+    return inferred is not None and inferred[0] == "datetime" and bool(set(inferred[1]) & (DAY_FIRST_FORMATS | MONTH_FIRST_FORMATS))
+
+def _cached_format(col: str, values: pd.Series):
+    sample = values.head(SAMPLE_SIZE)
+    key = _signature(col, sample)
+    # Shapes can't tell "25/12/2024" from "12/25/2024" (or "yes" from "maybe"), so a cached format
+    # is only reused while it still parses this sample
+    if key in _format_cache:
+        inferred = _format_cache[key]
+        if inferred is None or _parse_ratio(_convert(sample.astype("string"), *inferred)) >= MIN_PARSE_RATIO:
+            return inferred
+
+    inferred = infer_format(sample)
+    if not _order_dependent(inferred):
+        if len(_format_cache) >= MAX_CACHE_ENTRIES:
+            _format_cache.clear()
+        _format_cache[key] = inferred
+    return inferred
+
+def _convert(values: pd.Series, kind: str, formats: tuple) -> pd.Series:
+    stripped = values.str.strip()
+    if kind == "boolean":
+        return stripped.str.lower().map(BOOLEAN_VALUES).astype("boolean")
+    if kind == "numeric":
+        numbers = pd.to_numeric(stripped, errors="coerce")
+        if numbers.notna().all() and (numbers % 1 == 0).all():
+            return pd.to_numeric(numbers, downcast="integer")
+        # float32 only when every value survives the round trip exactly
+        floats = numbers.astype("float64")
+        narrow = floats.astype("float32")
+        if ((narrow.astype("float64") == floats) | floats.isna()).all():
+            return narrow
+        return floats
+
+    # One vectorized call per format, each only over rows the previous ones missed
+    parsed = pd.to_datetime(stripped, format=formats[0], errors="coerce")
+    for fmt in formats[1:]:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(stripped[missing], format=fmt, errors="coerce")
+    return parsed
+
+# 0️⃣ Coerce date / numeric / boolean columns
+def coerce_types(df: pd.DataFrame, report: dict = None, formats: dict = None):
+    """Converts string columns that look like dates, numbers or booleans.
+
+    Every converted column is followed by a "<col>_unparsed" column keeping the values that failed
+    to parse as text (empty when all parsed), so a file always gets the same columns whether it is
+    cleaned whole or chunk by chunk. Failures are also counted in report.
+    Pass the same formats dict for every chunk of a file: the first chunk fills it and later
+    chunks are parsed exactly like the first.
+    """
+    report = {} if report is None else report
+    columns = df.select_dtypes(include=["object"]).columns if formats is None else df.columns
+    for col in columns:
+        if formats is not None and col in formats:
+            inferred = formats[col]
+        elif df[col].dtype == object and not df[col].dropna().empty:
+            inferred = _cached_format(col, df[col].dropna().astype(str))
+        else:
+            inferred = None
+        if formats is not None:
+            formats.setdefault(col, inferred)
+        if inferred is None:
+            continue
+
+        kind, col_formats = inferred
+        original = df[col]
+        converted = _convert(original.astype("string"), kind, col_formats)
+        failed = original.notna() & converted.isna()
+        df[col] = converted
+
+        # String dtype (not object) so the fill / normalize steps leave these untouched
+        unparsed_col = f"{col}_unparsed"
+        if unparsed_col not in df.columns:
+            df.insert(df.columns.get_loc(col) + 1, unparsed_col, original.where(failed).astype("string"))
+
+        entry = report.setdefault(col, {
+            "type": kind, "formats": list(col_formats), "unparsed_column": unparsed_col,
+            "unparseable_count": 0, "unparseable_examples": [],
+        })
+        entry["unparseable_count"] += int(failed.sum())
+        room = MAX_UNPARSEABLE_EXAMPLES - len(entry["unparseable_examples"])
+        if room > 0:
+            entry["unparseable_examples"].extend(str(v) for v in original[failed].head(room).tolist())
+    return df
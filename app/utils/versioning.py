@@ -0,0 +1,89 @@
+import gzip
+import io
+import json
+import numpy as np
+import pandas as pd
+
+DELTA_FORMAT_VERSION = 1
+DELTA_MAX_RATIO = 0.5  # Store a full copy instead when the delta is not at least this much smaller
+MAX_DIFF_EXAMPLES = 20
+
+def read_rows(source) -> pd.DataFrame:
+    # Cleaned versions are compared as text, so a row hashes the same before and after a round trip to disk
+    return pd.read_csv(source, dtype=str, keep_default_na=False)
+
+def row_hashes(rows: pd.DataFrame) -> np.ndarray:
+    return pd.util.hash_pandas_object(rows, index=False).to_numpy()
+
+def build_delta(base_path: str, csv_text: str):
+    """Encodes csv_text against the base version; returns gzipped delta bytes, or None if the columns differ"""
+    base = read_rows(base_path)
+    new = read_rows(io.StringIO(csv_text))
+    if list(base.columns) != list(new.columns):
+        return None
+
+    # Position of each new row in the base (first match), -1 where the row is new
+    base_positions = pd.Series(np.arange(len(base)), index=row_hashes(base))
+    base_positions = base_positions[~base_positions.index.duplicated()]
+    positions = base_positions.reindex(row_hashes(new)).fillna(-1).astype(np.int64).to_numpy()
+
+    inserted = positions < 0
+    # Base rows are referenced by position, inserted rows as -(k + 1) into "rows"
+    order = positions.copy()
+    order[inserted] = -(np.arange(inserted.sum()) + 1)
+
+    delta = {
+        "format": DELTA_FORMAT_VERSION,
+        "columns": list(new.columns),
+        "order": order.tolist(),
+        "rows": new[inserted].values.tolist(),
+    }
+    return gzip.compress(json.dumps(delta, separators=(",", ":")).encode("utf-8"))
+
+def load_version(path: str, base_path: str = None) -> pd.DataFrame:
+    """Loads a stored version as text rows, rebuilding it from its base when it is a delta"""
+    if base_path is None:
+        return read_rows(path)
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        delta = json.load(f)
+    base = read_rows(base_path)
+    inserted = pd.DataFrame(delta["rows"], columns=delta["columns"], dtype=str)
+    combined = pd.concat([base, inserted], ignore_index=True)
+
+    order = np.asarray(delta["order"], dtype=np.int64)
+    take = np.where(order >= 0, order, len(base) - order - 1)
+    return combined.iloc[take].reset_index(drop=True)
+
+def diff_versions(old: pd.DataFrame, new: pd.DataFrame, key: str = None, limit: int = MAX_DIFF_EXAMPLES) -> dict:
+    """Row-level diff between two versions: inserted, deleted and (when a key column is given) changed rows"""
+    old_hashes, new_hashes = row_hashes(old), row_hashes(new)
+    inserted = new[~np.isin(new_hashes, old_hashes)]
+    deleted = old[~np.isin(old_hashes, new_hashes)]
+
+    changed = []
+    if key and key in new.columns and key in old.columns:
+        # A row deleted and re-inserted under the same key was changed in place
+        changed_keys = set(inserted[key]) & set(deleted[key])
+        before = deleted[deleted[key].isin(changed_keys)].drop_duplicates(subset=[key]).set_index(key)
+        after = inserted[inserted[key].isin(changed_keys)].drop_duplicates(subset=[key]).set_index(key)
+        for k in list(changed_keys)[:limit]:
+            old_row, new_row = before.loc[k], after.loc[k]
+            changed.append({
+                key: k,
+                "changes": {col: {"old": old_row[col], "new": new_row[col]} for col in before.columns if old_row[col] != new_row[col]},
+            })
+        inserted = inserted[~inserted[key].isin(changed_keys)]
+        deleted = deleted[~deleted[key].isin(changed_keys)]
+    else:
+        changed_keys = set()
+
+    return {
+        "inserted_count": len(inserted),
+        "deleted_count": len(deleted),
+        "changed_count": len(changed_keys),
+        "unchanged_count": int(np.isin(new_hashes, old_hashes).sum()),
+        "inserted": inserted.head(limit).to_dict(orient="records"),
+        "deleted": deleted.head(limit).to_dict(orient="records"),
+        "changed": changed,
+    }
@@ -0,0 +1,56 @@
+import tempfile
+import time
+import os
+import numpy as np
+import pandas as pd
+from app.utils.versioning import build_delta, load_version
+
+# A base cleaned file re-cleaned several times with a handful of rows changing each run
+ROWS = 200_000
+RUNS = 5
+CHANGED_ROWS = 100
+
+def make_cleaned_df(rows: int = ROWS) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "email": [f"user{i}@example.com" for i in range(rows)],
+        "name": [f"Person {i}" for i in range(rows)],
+        "signup_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+        "age": rng.integers(18, 90, rows),
+    })
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(1)
+    df = make_cleaned_df()
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = os.path.join(tmp, "base.csv")
+        df.to_csv(base_path, index=False, na_rep="NaN")
+        full_total = stored_total = os.path.getsize(base_path)
+        print(f"base: {full_total / 1e6:.2f} MB")
+
+        for run in range(1, RUNS + 1):
+            changed = rng.choice(len(df), CHANGED_ROWS, replace=False)
+            df.loc[changed, "age"] = df.loc[changed, "age"] + 1
+            csv_text = df.to_csv(index=False, na_rep="NaN")
+
+            start = time.perf_counter()
+            delta = build_delta(base_path, csv_text)
+            encode = time.perf_counter() - start
+            delta_path = os.path.join(tmp, f"run{run}.delta.json.gz")
+            with open(delta_path, "wb") as f:
+                f.write(delta)
+
+            start = time.perf_counter()
+            rebuilt = load_version(delta_path, base_path)
+            decode = time.perf_counter() - start
+            assert rebuilt.to_csv(index=False) == csv_text.replace("\r\n", "\n")
+
+            full_total += len(csv_text.encode("utf-8"))
+            stored_total += len(delta)
+            print(
+                f"run {run}: full {len(csv_text) / 1e6:.2f} MB  delta {len(delta) / 1e3:.1f} KB  "
+                f"encode {encode:.2f}s  rebuild {decode:.2f}s"
+            )
+
+        print(f"total: full copies {full_total / 1e6:.2f} MB, with deltas {stored_total / 1e6:.2f} MB "
+              f"({100 * (1 - stored_total / full_total):.1f}% saved)")
@@ -0,0 +1,47 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from app.utils.near_duplicates import find_near_duplicates
+
+# Rows with ~10% fuzzy copies (case, spacing and one-letter typos); also returns the real entity of each row
+def make_noisy_df(rows: int):
+    rng = np.random.default_rng(0)
+    base = rows - rows // 10
+    emails = [f"user{i}.{i * 7919 % 100_003}@example.com" for i in range(base)]
+    names = [f"person {i} surname{i % 977}" for i in range(base)]
+
+    copies = rng.integers(0, base, rows - base)
+    for i in copies.tolist():
+        email, name = emails[i], names[i]
+        pos = int(rng.integers(0, len(name)))
+        emails.append(f" {email.upper()} ")
+        names.append(name[:pos] + "x" + name[pos + 1:])
+    entities = np.concatenate([np.arange(base), copies])
+    return pd.DataFrame({"email": emails, "name": names}), entities
+
+def score(clusters: np.ndarray, entities: np.ndarray) -> dict:
+    # A removed row is correct when it belongs to the same entity as the row it was merged into
+    removed = clusters != np.arange(len(clusters))
+    correct = int((entities[removed] == entities[clusters[removed]]).sum())
+    copies = len(entities) - len(np.unique(entities))
+    mixed = pd.Series(entities).groupby(clusters).nunique().gt(1).sum()
+    return {
+        "removed": int(removed.sum()),
+        "precision": correct / removed.sum() if removed.any() else 1.0,
+        "recall": correct / copies if copies else 1.0,
+        "mixed_clusters": int(mixed),
+    }
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    for rows in sizes:
+        df, entities = make_noisy_df(rows)
+        start = time.perf_counter()
+        clusters = find_near_duplicates(df)
+        elapsed = time.perf_counter() - start
+        result = score(clusters, entities)
+        print(
+            f"rows={rows:>9}  {elapsed:7.2f}s  {rows / elapsed:>10.0f} rows/s  removed={result['removed']}  "
+            f"precision={result['precision']:.4f}  recall={result['recall']:.4f}  mixed_clusters={result['mixed_clusters']}"
+        )
@@ -0,0 +1,35 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from app.utils.cleaning_tools import get_cleaning_agent
+
+# Wide frame: lots of string columns with some missing values
+ROWS = 50_000
+STRING_COLS = 200
+
+def make_wide_df(rows: int = ROWS, string_cols: int = STRING_COLS) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {
+        "email": [f" User{i % 40_000}@Example.com " for i in range(rows)],
+        "signup_date": [f"2024-01-{i % 28 + 1:02d}" for i in range(rows)],
+        "name": [f"john doe {i}" for i in range(rows)],
+        "age": rng.integers(18, 90, rows).astype(float),
+    }
+    words = np.array(["alpha", "beta", None, "gamma", "delta"], dtype=object)
+    for c in range(string_cols):
+        data[f"col_{c}"] = words[rng.integers(0, len(words), rows)]
+    return pd.DataFrame(data)
+
+if __name__ == "__main__":
+    base = make_wide_df()
+    print(f"Frame: {base.shape[0]} rows x {base.shape[1]} columns")
+
+    baseline = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        df = base.copy()
+        start = time.perf_counter()
+        get_cleaning_agent(df, workers=workers).run("benchmark")
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"workers={workers:>2}  {elapsed:7.2f}s  speedup x{baseline / elapsed:.2f}")